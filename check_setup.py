@@ -4,6 +4,10 @@
 import sys
 import os
 
+from env_file import load_env
+
+load_env()
+
 print("=" * 50)
 print("Python 및 Claude 코드 설정 확인")
 print("=" * 50)
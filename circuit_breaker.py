@@ -0,0 +1,184 @@
+"""
+모델/엔드포인트별 서킷 브레이커
+
+장애 중에는 타임아웃을 기다리지 않고 즉시 실패시키고(open),
+일정 시간 뒤 제한된 요청으로 복구 여부를 확인합니다(half-open).
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않고 바로 실패한 요청"""
+
+
+# 상위 서비스 장애로 볼 예외 (anthropic/httpx를 import하지 않도록 클래스 이름으로 판별)
+_TRANSPORT_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "TransportError",
+    "TimeoutException",
+}
+
+
+def is_upstream_failure(error):
+    """
+    서킷 브레이커가 실패로 집계할 예외인지 판별
+
+    5xx/429 응답, 연결 오류, 타임아웃만 실패로 보고
+    400/401/413 같은 요청 자체의 오류는 집계하지 않습니다.
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500 or status_code == 429
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in _TRANSPORT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    def __init__(self, name="", error_rate=0.5, slow_call_seconds=None, slow_call_rate=0.5,
+                 window=20, min_calls=10, open_seconds=30.0, half_open_max_calls=1,
+                 failure_exceptions=None):
+        """
+        서킷 브레이커 초기화
+
+        Args:
+            name: 오류 메시지에 표시할 이름 (예: "모델 @ base_url")
+            error_rate: 최근 호출 중 실패 비율이 이 값 이상이면 open
+            slow_call_seconds: 이 시간보다 오래 걸린 호출을 느린 호출로 집계 (None이면 사용 안 함)
+            slow_call_rate: 느린 호출 비율이 이 값 이상이면 open
+            window: 비율 계산에 쓸 최근 호출 수
+            min_calls: 이 수만큼 호출이 쌓이기 전에는 열지 않음
+            open_seconds: open 상태 유지 시간 (이후 half-open으로 전환)
+            half_open_max_calls: half-open 상태에서 허용할 시험 호출 수
+            failure_exceptions: 실패로 집계할 예외 타입 튜플 (없으면 is_upstream_failure로 판별)
+        """
+        self.name = name
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+        self._outcomes = deque(maxlen=window)  # (실패 여부, 느린 호출 여부)
+        self._state = CLOSED
+        # 상태가 바뀔 때마다 증가: 이전 상태에서 허용된 호출의 결과는 무시
+        self._generation = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """현재 상태 (closed / open / half_open)"""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _transition(self, state):
+        self._state = state
+        self._generation += 1
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+
+    def _refresh(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    def allow(self):
+        """
+        호출 허용 여부 확인 (허용되면 half-open 시험 호출 슬롯을 차지함)
+
+        Returns:
+            허용되면 record()에 넘길 토큰, 허용되지 않으면 None
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return (self._generation, CLOSED)
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return (self._generation, HALF_OPEN)
+            return None
+
+    def is_failure(self, error):
+        """예외를 실패로 집계할지 판별"""
+        if self.failure_exceptions is not None:
+            return isinstance(error, self.failure_exceptions)
+        return is_upstream_failure(error)
+
+    def release(self, token):
+        """결과를 집계하지 않고 half-open 시험 호출 슬롯만 반환"""
+        generation, admitted_in = token
+        with self._lock:
+            if admitted_in == HALF_OPEN and generation == self._generation:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, token, success, latency):
+        """
+        호출 결과 기록
+
+        Args:
+            token: allow()가 돌려준 토큰
+            success: 성공 여부
+            latency: 소요 시간(초)
+        """
+        slow = self.slow_call_seconds is not None and latency >= self.slow_call_seconds
+        generation, admitted_in = token
+        with self._lock:
+            self._refresh()
+            if generation != self._generation:
+                # 다른 상태에서 허용된 호출 (예: open 이전에 시작된 느린 호출)
+                return
+            if admitted_in == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(CLOSED)
+                return
+            self._outcomes.append((not success, slow))
+            total = len(self._outcomes)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            slow_calls = sum(1 for _, is_slow in self._outcomes if is_slow)
+            if failures / total >= self.error_rate or slow_calls / total >= self.slow_call_rate:
+                self._transition(OPEN)
+
+    def call(self, fn, *args, **kwargs):
+        """
+        서킷 브레이커를 거쳐 fn 실행
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있을 때
+        """
+        token = self.allow()
+        if token is None:
+            raise CircuitOpenError(f"서킷이 열려 있어 요청을 보내지 않았습니다: {self.name}")
+        start = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            # 요청 자체의 오류(400 등)는 상위 서비스가 응답한 것이므로 성공으로 집계
+            self.record(token, not self.is_failure(e), time.monotonic() - start)
+            raise
+        except BaseException:
+            # KeyboardInterrupt 등: 결과를 집계하지 않고 시험 호출 슬롯만 반환
+            self.release(token)
+            raise
+        self.record(token, True, time.monotonic() - start)
+        return result
@@ -2,30 +2,102 @@
 Claude API 클라이언트 연결 코드
 """
 import os
-from anthropic import Anthropic
+import threading
+import time
 
-# .env 파일 지원
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # python-dotenv가 없어도 환경변수로 작동 가능
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from env_file import load_env
+
+# .env 파일 지원 (표준 라이브러리 파서라 import 비용 없음)
+load_env()
 
 class ClaudeClient:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, hedging=None, base_url=None,
+                 circuit_breaker=None, fallback_model=None, image_encoder=None,
+                 transport=None):
         """
         Claude API 클라이언트 초기화
         
         Args:
             api_key: Anthropic API 키 (없으면 환경변수에서 가져옴)
+            hedging: 헤지 요청 정책 (hedging.HedgingPolicy, 없으면 사용 안 함)
+            base_url: API 주소 (없으면 ANTHROPIC_BASE_URL 또는 기본 주소)
+            circuit_breaker: 서킷 브레이커 설정 (True 또는 CircuitBreaker 인자 dict, 없으면 사용 안 함)
+            fallback_model: 서킷이 열렸을 때 대신 사용할 모델
+            image_encoder: 이미지 인코더 (image_input.ImageEncoder, 없으면 공용 인코더)
+            transport: 전송 계층 (transport 모듈의 기록/재생 전송 등, 없으면 실제 API 호출)
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-        if not self.api_key:
+        if not self.api_key and transport is None:
             raise ValueError("API 키가 필요합니다. 환경변수 ANTHROPIC_API_KEY를 설정하거나 api_key 파라미터를 제공하세요.")
         
-        self.client = Anthropic(api_key=self.api_key)
+        self.base_url = base_url or os.getenv("ANTHROPIC_BASE_URL") or "https://api.anthropic.com"
+        if transport is None:
+            from transport import AnthropicTransport
+            transport = AnthropicTransport(self.api_key, self.base_url)
+        self.transport = transport
+        self.client = getattr(transport, "client", None)
+        self.hedging = hedging
+        self.fallback_model = fallback_model
+        self.image_encoder = image_encoder
+        if circuit_breaker is True:
+            circuit_breaker = {}
+        self._breaker_settings = circuit_breaker
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
+    
+    def breaker(self, model):
+        """
+        모델/엔드포인트별 서킷 브레이커 조회 (서킷 브레이커를 쓰지 않으면 None)
+        """
+        if self._breaker_settings is None:
+            return None
+        key = (model, self.base_url)
+        with self._breakers_lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    name=f"{model} @ {self.base_url}", **self._breaker_settings
+                )
+            return self._breakers[key]
+    
+    def _create(self, model, max_tokens, messages):
+        """API 호출 후 응답 텍스트 반환 (실패 시 예외 발생)"""
+        breaker = self.breaker(model)
+        if breaker is None:
+            return self._call(model, max_tokens, messages)
+        try:
+            return breaker.call(self._call, model, max_tokens, messages)
+        except CircuitOpenError:
+            if not self.fallback_model or self.fallback_model == model:
+                raise
+            fallback = self.breaker(self.fallback_model)
+            return fallback.call(self._call, self.fallback_model, max_tokens, messages)
+    
+    def _call(self, model, max_tokens, messages):
+        def call():
+            return self.transport.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=messages
+            )
+        
+        if self.hedging is not None:
+            return self.hedging.run(call)
+        return call()
+    
+    def _with_images(self, content, images):
+        """텍스트 내용 앞에 이미지 블록을 붙인 content 리스트 생성"""
+        if not images:
+            return content
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        if self.image_encoder is None:
+            from image_input import default_encoder
+            self.image_encoder = default_encoder()
+        encoder = self.image_encoder
+        return [encoder.content_block(image) for image in images] + list(content)
     
-    def send_message(self, message, model="claude-3-5-sonnet-20241022", max_tokens=1024):
+    def send_message(self, message, model="claude-3-5-sonnet-20241022", max_tokens=1024, images=None):
         """
         Claude에게 메시지 전송
         
@@ -33,23 +105,19 @@ class ClaudeClient:
             message: 전송할 메시지
             model: 사용할 모델 (기본값: claude-3-5-sonnet-20241022)
             max_tokens: 최대 토큰 수
+            images: 함께 보낼 이미지 리스트 (파일 경로, bytes 또는 mmap)
             
         Returns:
             Claude의 응답
         """
         try:
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                messages=[
-                    {"role": "user", "content": message}
-                ]
-            )
-            return response.content[0].text
+            return self._create(model, max_tokens, [
+                {"role": "user", "content": self._with_images(message, images)}
+            ])
         except Exception as e:
             return f"오류 발생: {str(e)}"
     
-    def chat(self, messages, model="claude-3-5-sonnet-20241022", max_tokens=1024):
+    def chat(self, messages, model="claude-3-5-sonnet-20241022", max_tokens=1024, images=None):
         """
         대화형 채팅
         
@@ -57,19 +125,92 @@ class ClaudeClient:
             messages: 메시지 리스트 (예: [{"role": "user", "content": "안녕하세요"}])
             model: 사용할 모델
             max_tokens: 최대 토큰 수
+            images: 마지막 사용자 메시지에 붙일 이미지 리스트 (파일 경로, bytes 또는 mmap)
             
         Returns:
             Claude의 응답
         """
         try:
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                messages=messages
-            )
-            return response.content[0].text
+            if images:
+                last = messages[-1]
+                messages = messages[:-1] + [
+                    {**last, "content": self._with_images(last["content"], images)}
+                ]
+            return self._create(model, max_tokens, messages)
+        except Exception as e:
+            return f"오류 발생: {str(e)}"
+    
+    def stream_message(self, message, model="claude-3-5-sonnet-20241022", max_tokens=1024, images=None):
+        """
+        Claude 응답을 스트리밍으로 받기 (서킷 브레이커 적용, 헤지 요청은 적용하지 않음)
+        
+        Args:
+            message: 전송할 메시지
+            model: 사용할 모델
+            max_tokens: 최대 토큰 수
+            images: 함께 보낼 이미지 리스트 (파일 경로, bytes 또는 mmap)
+            
+        Returns:
+            응답 텍스트 조각을 순서대로 내보내는 제너레이터
+            (오류가 나면 마지막 조각으로 "오류 발생: ..."을 내보냄)
+        """
+        try:
+            messages = [{"role": "user", "content": self._with_images(message, images)}]
+            yield from self._stream(model, max_tokens, messages)
+        except Exception as e:
+            yield f"오류 발생: {str(e)}"
+    
+    def _stream(self, model, max_tokens, messages):
+        """서킷 브레이커를 거쳐 스트리밍 (느린 호출 판정은 첫 조각까지의 시간 기준)"""
+        breaker = self.breaker(model)
+        if breaker is None:
+            yield from self.transport.stream(model=model, max_tokens=max_tokens, messages=messages)
+            return
+        token = breaker.allow()
+        if token is None and self.fallback_model and self.fallback_model != model:
+            model = self.fallback_model
+            breaker = self.breaker(model)
+            token = breaker.allow()
+        if token is None:
+            raise CircuitOpenError(f"서킷이 열려 있어 요청을 보내지 않았습니다: {breaker.name}")
+        
+        start = time.monotonic()
+        first_chunk = None
+        try:
+            for text in self.transport.stream(model=model, max_tokens=max_tokens, messages=messages):
+                if first_chunk is None:
+                    first_chunk = time.monotonic() - start
+                yield text
+        except Exception as e:
+            breaker.record(token, not breaker.is_failure(e), time.monotonic() - start)
+            raise
+        except BaseException:
+            # 호출한 쪽이 스트림을 중간에 닫은 경우 (GeneratorExit 등)
+            breaker.release(token)
+            raise
+        breaker.record(token, True, first_chunk if first_chunk is not None else time.monotonic() - start)
+    
+    def chat_session(self, store, session_id, message, model="claude-3-5-sonnet-20241022", max_tokens=1024):
+        """
+        세션 저장소를 사용하는 대화형 채팅
+        
+        Args:
+            store: 세션 저장소 (session_store.SessionStore)
+            session_id: 세션 ID
+            message: 이번 사용자 메시지
+            model: 사용할 모델
+            max_tokens: 최대 토큰 수
+            
+        Returns:
+            Claude의 응답 (성공한 경우에만 질문과 응답을 세션에 기록)
+        """
+        user_turn = {"role": "user", "content": message}
+        try:
+            response = self._create(model, max_tokens, store.messages(session_id, [user_turn]))
         except Exception as e:
             return f"오류 발생: {str(e)}"
+        store.append(session_id, user_turn, {"role": "assistant", "content": response})
+        return response
 
 
 if __name__ == "__main__":
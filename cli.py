@@ -0,0 +1,225 @@
+"""
+통합 명령줄 도구
+
+사용법:
+    python cli.py login            대화형 로그인 (API 키 설정)
+    python cli.py verify [--live]  API 키/클라이언트 확인
+    python cli.py doctor           설치 상태 점검
+    python cli.py run "메시지"      메시지 전송
+    python cli.py bench            import 시간 회귀 검사 (+ --requests N 으로 API 지연 측정,
+                                   --replay 카세트 로 기록된 트래픽 재생)
+
+시작 시간을 줄이기 위해 무거운 모듈(anthropic 등)은 실제로 필요한 하위 명령에서만 불러옵니다.
+"""
+import argparse
+import os
+import sys
+
+# claude_client를 불러올 때 로드되면 안 되는 모듈
+HEAVY_MODULES = ("anthropic", "httpx", "dotenv", "PIL")
+
+
+def cmd_login(args):
+    """대화형 로그인"""
+    import login
+    return 0 if login.login() else 1
+
+
+def cmd_verify(args):
+    """API 키 확인 및 클라이언트 초기화 (--live면 실제 요청까지)"""
+    from env_file import get_api_key
+    api_key = get_api_key()
+    if not api_key:
+        print("❌ API 키가 설정되지 않았습니다. python cli.py login 으로 설정하세요.")
+        return 1
+    print(f"✓ API 키가 설정되어 있습니다. (길이: {len(api_key)} 문자)")
+
+    from claude_client import ClaudeClient
+    try:
+        claude = ClaudeClient(api_key=api_key)
+    except Exception as e:
+        print(f"❌ 클라이언트 초기화 실패: {e}")
+        return 1
+    print("✓ Claude 클라이언트 초기화 성공!")
+
+    if args.live:
+        response = claude.send_message("ping", max_tokens=8)
+        if response.startswith("오류 발생:"):
+            print(f"❌ API 호출 실패: {response}")
+            return 1
+        print("✓ API 호출 성공")
+    return 0
+
+
+def cmd_doctor(args):
+    """설치 상태 점검 (패키지는 import하지 않고 설치 여부만 확인)"""
+    import importlib.util
+    from env_file import MODULE_DIR, find_env_file, get_api_key
+
+    ok = True
+    print(f"[1] Python 버전: {sys.version.split()[0]} ({sys.executable})")
+    if sys.version_info < (3, 8):
+        print("    ✗ Python 3.8 이상이 필요합니다.")
+        ok = False
+
+    print(f"[2] 파일 확인 ({MODULE_DIR}):")
+    for file in ("claude_client.py", "env_file.py", "requirements.txt"):
+        exists = (MODULE_DIR / file).exists()
+        ok = ok and exists
+        print(f"    {'✓' if exists else '✗'} {file}")
+    env_path = find_env_file()
+    print(f"    {'✓' if env_path.exists() else '⚠'} .env ({env_path})")
+
+    print("[3] 패키지 확인:")
+    for package, required in (("anthropic", True), ("PIL", False)):
+        installed = importlib.util.find_spec(package) is not None
+        if required:
+            ok = ok and installed
+        mark = "✓" if installed else ("✗" if required else "⚠")
+        note = "" if required else " (선택: 이미지 축소/재인코딩)"
+        print(f"    {mark} {package}{note}")
+
+    print("[4] API 키 확인:")
+    api_key = get_api_key()
+    if api_key:
+        print(f"    ✓ ANTHROPIC_API_KEY 설정됨 (길이: {len(api_key)} 문자)")
+    else:
+        print("    ✗ ANTHROPIC_API_KEY 미설정 → python cli.py login")
+        ok = False
+    return 0 if ok else 1
+
+
+def cmd_run(args):
+    """메시지 전송"""
+    from claude_client import ClaudeClient
+    message = args.message if args.message != "-" else sys.stdin.read()
+    try:
+        claude = ClaudeClient()
+    except ValueError as e:
+        print(f"설정 오류: {e}")
+        return 1
+    response = claude.send_message(message, model=args.model, max_tokens=args.max_tokens,
+                                   images=args.image or None)
+    print(response)
+    return 1 if response.startswith("오류 발생:") else 0
+
+
+def measure_import(module="claude_client"):
+    """
+    새 인터프리터에서 모듈 import 시간과 함께 로드된 무거운 모듈 측정
+
+    Returns:
+        (import 시간(초), 로드된 무거운 모듈 리스트)
+    """
+    import json
+    import subprocess
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps([elapsed, heavy]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    elapsed, heavy = json.loads(output.strip().splitlines()[-1])
+    return elapsed, heavy
+
+
+def cmd_bench(args):
+    """import 시간 회귀 검사, --requests가 있으면 API 지연 측정, --replay가 있으면 카세트 재생 측정"""
+    status = 0
+    for module in ("claude_client", "cli"):
+        elapsed, heavy = measure_import(module)
+        problems = []
+        if heavy:
+            problems.append(f"무거운 모듈 로드됨: {', '.join(heavy)}")
+        if elapsed * 1000 > args.import_budget_ms:
+            problems.append(f"예산 {args.import_budget_ms:.0f}ms 초과")
+        mark = "✗" if problems else "✓"
+        detail = f" ({'; '.join(problems)})" if problems else ""
+        print(f"{mark} import {module}: {elapsed * 1000:.1f}ms{detail}")
+        if problems:
+            status = 1
+
+    if args.requests:
+        from claude_client import ClaudeClient
+        claude = ClaudeClient()
+        calls = [lambda: claude.send_message("ping", model=args.model, max_tokens=8)] * args.requests
+        report_latencies("요청", calls)
+
+    if args.replay:
+        from claude_client import ClaudeClient
+        from transport import ReplayTransport
+        claude = ClaudeClient(transport=ReplayTransport(args.replay, speed=args.speed))
+        calls = []
+        for kind, request in claude.transport.requests():
+            if kind == "stream":
+                calls.append(lambda r=request: "".join(claude.transport.stream(**r)))
+            else:
+                calls.append(lambda r=request: claude.chat(r["messages"], model=r["model"],
+                                                           max_tokens=r["max_tokens"]))
+        report_latencies(f"재생({args.replay})", calls)
+    return status
+
+
+def report_latencies(label, calls):
+    """calls를 차례로 실행하고 지연 시간 중앙값/p99 출력"""
+    import statistics
+    import time
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    if not latencies:
+        print(f"{label}: 실행할 요청이 없습니다.")
+        return
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label} {len(latencies)}회: 중앙값 {statistics.median(latencies) * 1000:.1f}ms, "
+          f"p99 {p99 * 1000:.1f}ms, 합계 {sum(latencies):.2f}s")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Claude API 통합 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("login", help="대화형 로그인 (API 키 설정)").set_defaults(func=cmd_login)
+
+    verify = sub.add_parser("verify", help="API 키/클라이언트 확인")
+    verify.add_argument("--live", action="store_true", help="실제 API 호출까지 확인")
+    verify.set_defaults(func=cmd_verify)
+
+    sub.add_parser("doctor", help="설치 상태 점검").set_defaults(func=cmd_doctor)
+
+    run = sub.add_parser("run", help="메시지 전송")
+    run.add_argument("message", help="보낼 메시지 ('-'이면 표준 입력)")
+    run.add_argument("--model", default="claude-3-5-sonnet-20241022")
+    run.add_argument("--max-tokens", type=int, default=1024)
+    run.add_argument("--image", action="append", help="함께 보낼 이미지 파일 (여러 번 지정 가능)")
+    run.set_defaults(func=cmd_run)
+
+    bench = sub.add_parser("bench", help="import 시간 회귀 검사 / API 지연 측정")
+    bench.add_argument("--import-budget-ms", type=float, default=100.0,
+                       help="모듈 import 시간 예산 (기본 100ms)")
+    bench.add_argument("--requests", type=int, default=0, help="API 지연 측정 요청 수")
+    bench.add_argument("--model", default="claude-3-5-sonnet-20241022")
+    bench.add_argument("--replay", help="카세트 파일의 요청을 API 호출 없이 재생해 측정")
+    bench.add_argument("--speed", type=float, default=None,
+                       help="재생 속도 (생략하면 지연 없이, 1.0이면 기록된 시간 그대로)")
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
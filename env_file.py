@@ -0,0 +1,147 @@
+"""
+.env 파일 읽기/쓰기 공용 함수
+
+표준 라이브러리만 사용하므로 import 비용이 거의 없습니다.
+경로를 지정하지 않으면 읽을 때는 python-dotenv와 같이 이 모듈이 있는 디렉터리부터
+상위로 올라가며 .env를 찾으므로, 다른 작업 디렉터리에서 실행해도 같은 파일을 사용합니다.
+쓸 때는 항상 이 저장소(모듈 디렉터리)의 .env에만 기록합니다.
+"""
+import os
+import re
+from pathlib import Path
+
+ENV_HEADER = (
+    "# Claude API 키 설정\n"
+    "# 이 파일은 .gitignore에 포함되어 있어 Git에 커밋되지 않습니다\n\n"
+)
+
+MODULE_DIR = Path(__file__).resolve().parent
+
+_LINE_RE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.-]*)\s*=\s*(.*)$")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+
+
+def find_env_file(filename=".env"):
+    """
+    .env 파일 경로 찾기 (모듈 디렉터리부터 상위로 탐색)
+
+    Returns:
+        찾은 파일 경로, 없으면 모듈 디렉터리의 .env 경로 (새로 만들 위치)
+    """
+    for directory in (MODULE_DIR, *MODULE_DIR.parents):
+        candidate = directory / filename
+        if candidate.is_file():
+            return candidate
+    return MODULE_DIR / filename
+
+
+def _parse_value(raw):
+    """값 부분 해석 (따옴표, 이스케이프, 줄 끝 주석 처리)"""
+    raw = raw.strip()
+    if raw[:1] in ("'", '"'):
+        quote = raw[0]
+        chars = []
+        i = 1
+        while i < len(raw):
+            ch = raw[i]
+            if ch == "\\" and quote == '"' and i + 1 < len(raw):
+                chars.append(_ESCAPES.get(raw[i + 1], "\\" + raw[i + 1]))
+                i += 2
+                continue
+            if ch == quote:
+                return "".join(chars)
+            chars.append(ch)
+            i += 1
+        # 닫는 따옴표가 없으면 그대로 사용
+        return raw
+    # 따옴표 없는 값은 공백 뒤의 #부터 주석
+    return re.split(r"\s+#", raw, maxsplit=1)[0].strip()
+
+
+def _format_value(value):
+    """필요할 때만 큰따옴표로 감싸 기록"""
+    value = str(value)
+    if value and re.fullmatch(r"[^\s#'\"\\]+", value):
+        return value
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"')
+               .replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t"))
+    return f'"{escaped}"'
+
+
+def read_env(path=None):
+    """
+    .env 파일을 dict로 읽기
+
+    Args:
+        path: .env 파일 경로 (없으면 find_env_file()로 찾음)
+
+    Returns:
+        {키: 값} dict (파일이 없으면 빈 dict)
+    """
+    values = {}
+    env_file = Path(path) if path is not None else find_env_file()
+    if not env_file.exists():
+        return values
+    with open(env_file, "r", encoding="utf-8") as f:
+        for line in f:
+            match = _LINE_RE.match(line)
+            if match and not line.lstrip().startswith("#"):
+                values[match.group(1)] = _parse_value(match.group(2))
+    return values
+
+
+def load_env(path=None):
+    """
+    .env 값을 환경변수에 반영 (이미 설정된 환경변수는 덮어쓰지 않음)
+    """
+    for key, value in read_env(path).items():
+        os.environ.setdefault(key, value)
+
+
+def write_env(values, path=None):
+    """
+    .env 파일 갱신 (주석과 다른 키는 그대로 두고 전달한 키만 변경)
+
+    같은 키가 여러 줄에 있으면 첫 줄을 새 값으로 바꾸고 나머지 줄은 지웁니다
+    (read_env는 마지막 값을 쓰므로 남겨 두면 이전 값이 계속 읽힘).
+
+    Args:
+        values: 저장할 {키: 값} dict
+        path: .env 파일 경로 (없으면 이 저장소의 .env, 상위 디렉터리 파일에는 쓰지 않음)
+    """
+    env_file = Path(path) if path is not None else MODULE_DIR / ".env"
+    written = set()
+    lines = []
+    if env_file.exists():
+        with open(env_file, "r", encoding="utf-8") as f:
+            for line in f:
+                match = _LINE_RE.match(line)
+                if match and not line.lstrip().startswith("#") and match.group(1) in values:
+                    key = match.group(1)
+                    if key not in written:
+                        lines.append(f"{key}={_format_value(values[key])}\n")
+                        written.add(key)
+                else:
+                    lines.append(line if line.endswith("\n") else line + "\n")
+    else:
+        lines.append(ENV_HEADER)
+    for key, value in values.items():
+        if key not in written:
+            lines.append(f"{key}={_format_value(value)}\n")
+    with open(env_file, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+def save_api_key(api_key, path=None):
+    """API 키를 .env 파일에 저장 (기본: 이 저장소의 .env)"""
+    write_env({"ANTHROPIC_API_KEY": api_key}, path)
+
+
+def get_api_key(path=None):
+    """
+    API 키 조회 (환경변수 우선, 없으면 .env 파일)
+
+    Returns:
+        API 키 문자열 또는 None
+    """
+    return os.getenv("ANTHROPIC_API_KEY") or read_env(path).get("ANTHROPIC_API_KEY")
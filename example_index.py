@@ -0,0 +1,182 @@
+"""
+과거 생성 결과(backups/) 기반 BM25 예시 검색
+
+새 매물과 지역/매물 유형이 비슷한 채택 결과 top-k만 골라
+짧은 few-shot 예시 블록으로 프롬프트에 넣을 수 있게 합니다.
+외부 서비스 없이 메모리 역색인으로 동작합니다.
+"""
+import json
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """
+    검색용 토큰화
+
+    어절 단위 토큰과 함께 한글 조사/어미 변화에 강하도록 문자 bigram을 추가합니다.
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        tokens.append(word)
+        if len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _record_text(property_data):
+    """검색 대상 필드를 하나의 텍스트로 합치기"""
+    fields = ["title", "region", "property_type", "deal_type", "floor", "highlights"]
+    parts = [str(property_data.get(field) or "") for field in fields]
+    parts.extend(property_data.get("options") or [])
+    return " ".join(parts)
+
+
+class ExampleIndex:
+    def __init__(self, k1=1.5, b=0.75, region_boost=2.0, type_boost=1.5):
+        """
+        BM25 역색인
+
+        Args:
+            k1, b: BM25 파라미터
+            region_boost: 시/군/구가 같은 문서에 곱할 가중치
+            type_boost: 매물 유형(property_type)이 같은 문서에 곱할 가중치
+        """
+        self.k1 = k1
+        self.b = b
+        self.region_boost = region_boost
+        self.type_boost = type_boost
+        self.records = []
+        self._postings = defaultdict(dict)  # term -> {doc_id: tf}
+        self._doc_lengths = []
+        self._total_length = 0
+        self._sources = set()
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record, source=None):
+        """
+        레코드 1건 추가 (증분 갱신)
+
+        Args:
+            record: {"propertyData": {...}, "content": {...}} 형식의 결과
+            source: 중복 추가 방지용 식별자 (예: 백업 파일 경로)
+
+        Returns:
+            추가되었으면 True, 이미 있는 source면 False
+        """
+        if source is not None:
+            if source in self._sources:
+                return False
+            self._sources.add(source)
+        doc_id = len(self.records)
+        terms = Counter(tokenize(_record_text(record.get("propertyData") or {})))
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        length = sum(terms.values())
+        self.records.append(record)
+        self._doc_lengths.append(length)
+        self._total_length += length
+        return True
+
+    def add_directory(self, directory="backups"):
+        """
+        백업 디렉터리의 JSON 파일을 색인 (이미 색인한 파일은 건너뜀)
+
+        Returns:
+            새로 추가된 레코드 수
+        """
+        added = 0
+        for path in sorted(Path(directory).glob("*.json")):
+            source = str(path.resolve())
+            if source in self._sources:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if "propertyData" in record and self.add(record, source=source):
+                added += 1
+        return added
+
+    def search(self, property_data, top_k=3):
+        """
+        새 매물과 비슷한 과거 결과 검색
+
+        Args:
+            property_data: 새 매물의 propertyData dict
+            top_k: 반환할 개수
+
+        Returns:
+            (점수, 레코드) 리스트, 점수 내림차순
+        """
+        if not self.records:
+            return []
+        n_docs = len(self.records)
+        avg_length = self._total_length / n_docs or 1.0
+        scores = defaultdict(float)
+        for term in set(tokenize(_record_text(property_data))):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        region = _district(property_data.get("region"))
+        property_type = property_data.get("property_type")
+        for doc_id in scores:
+            data = self.records[doc_id].get("propertyData") or {}
+            if region and _district(data.get("region")) == region:
+                scores[doc_id] *= self.region_boost
+            if property_type and data.get("property_type") == property_type:
+                scores[doc_id] *= self.type_boost
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(score, self.records[doc_id]) for doc_id, score in ranked]
+
+    def format_examples(self, property_data, top_k=2, fields=("description",)):
+        """
+        검색 결과를 프롬프트용 few-shot 블록으로 변환
+
+        Args:
+            property_data: 새 매물의 propertyData dict
+            top_k: 넣을 예시 개수
+            fields: 예시로 보여줄 content 필드
+
+        Returns:
+            예시 블록 문자열 (결과가 없으면 빈 문자열)
+        """
+        blocks = []
+        for i, (_, record) in enumerate(self.search(property_data, top_k=top_k), 1):
+            data = record.get("propertyData") or {}
+            content = record.get("content") or {}
+            lines = [f"[예시 {i}] {data.get('region', '')} / {data.get('property_type', '')} / {data.get('deal_type', '')}"]
+            for field in fields:
+                if content.get(field):
+                    lines.append(f"{field}: {content[field]}")
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+
+def _district(region):
+    """'경기 이천시 관고동' -> '경기 이천시' (시/군/구 단위까지만 비교)"""
+    parts = (region or "").split()
+    return " ".join(parts[:2])
+
+
+if __name__ == "__main__":
+    # 사용 예제
+    index = ExampleIndex()
+    print(f"색인된 백업: {index.add_directory('backups')}건")
+    query = {"region": "경기 이천시 증포동", "property_type": "OFFICETEL", "deal_type": "JEONSE"}
+    print(index.format_examples(query))
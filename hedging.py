@@ -0,0 +1,157 @@
+"""
+헤지 요청(hedged request) 정책
+
+최근 지연 시간의 백분위수보다 오래 걸리는 요청이 있으면 같은 요청을 한 번 더 보내고
+먼저 끝난 응답을 사용합니다. 추가 요청 비율은 예산(budget)으로 제한합니다.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+
+class HedgingPolicy:
+    def __init__(self, percentile=0.95, budget=0.05, window=200, min_samples=20,
+                 min_delay=0.05, max_workers=8):
+        """
+        헤지 정책 초기화
+
+        Args:
+            percentile: 헤지 기준이 되는 지연 시간 백분위수 (0~1)
+            budget: 전체 요청 대비 헤지 요청의 최대 비율 (0.05 = 5%)
+            window: 백분위수 계산에 쓸 최근 지연 시간 개수
+            min_samples: 이 개수만큼 지연 시간이 쌓이기 전에는 헤지하지 않음
+            min_delay: 헤지 대기 시간의 하한(초)
+            max_workers: 헤지 요청 실행용 스레드 수 (첫 요청은 풀을 쓰지 않음)
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self.stats = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "latency_saved": 0.0,
+        }
+
+    def hedge_delay(self):
+        """
+        현재 헤지 대기 시간(초)
+
+        Returns:
+            표본이 부족하면 None
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile))
+        return max(self.min_delay, ordered[index])
+
+    def hedge_rate(self):
+        """지금까지 헤지된 요청 비율"""
+        with self._lock:
+            if not self.stats["requests"]:
+                return 0.0
+            return self.stats["hedged"] / self.stats["requests"]
+
+    def _record_latency(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _try_acquire_budget(self):
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.budget * self.stats["requests"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def run(self, fn, *args, **kwargs):
+        """
+        헤지 정책을 적용해 fn 실행
+
+        Returns:
+            먼저 성공한 호출의 결과 (둘 다 실패하면 첫 요청의 예외를 다시 발생)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+        delay = self.hedge_delay()
+        if delay is None:
+            # 표본이 쌓이기 전에는 호출한 스레드에서 그대로 실행
+            start = time.monotonic()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record_latency(time.monotonic() - start)
+
+        # 첫 요청은 풀을 거치지 않고 전용 스레드에서 바로 시작 (동시 요청 수 제한 없음)
+        primary = Future()
+        primary_timing = {}
+        threading.Thread(
+            target=self._run_into, args=(primary, primary_timing, fn, args, kwargs, True),
+            name="hedge-primary", daemon=True,
+        ).start()
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._try_acquire_budget():
+            return primary.result()
+
+        # 헤지 요청만 스레드 풀 사용
+        hedge = Future()
+        hedge_timing = {}
+        self._executor.submit(self._run_into, hedge, hedge_timing, fn, args, kwargs, False)
+        pending = {primary, hedge}
+        winner = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+            if winner is not None:
+                break
+        for future in pending:
+            # 이미 실행 중인 스레드는 중단할 수 없으므로 결과만 버림
+            future.cancel()
+
+        if winner is None:
+            return primary.result()
+        if winner is hedge:
+            with self._lock:
+                self.stats["hedge_wins"] += 1
+
+            def on_loser_done(_):
+                with self._lock:
+                    self.stats["latency_saved"] += max(0.0, primary_timing["end"] - hedge_timing["end"])
+
+            primary.add_done_callback(on_loser_done)
+        return winner.result()
+
+    def _run_into(self, future, timing, fn, args, kwargs, record):
+        """fn을 실행해 결과를 future에 기록 (지연 시간은 실제 시작 시점부터 측정)"""
+        if not future.set_running_or_notify_cancel():
+            return
+        timing["start"] = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            timing["end"] = time.monotonic()
+            error = e
+        else:
+            timing["end"] = time.monotonic()
+            error = None
+        if record:
+            # 헤지 여부와 무관하게 첫 요청의 실제 지연 시간을 표본으로 사용
+            self._record_latency(timing["end"] - timing["start"])
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def shutdown(self):
+        """실행 스레드 정리"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,216 @@
+"""
+이미지 입력 전처리
+
+매물 사진/평면도를 모델의 유효 해상도로 줄이고 JPEG/WebP로 다시 인코딩한 뒤
+Claude 메시지용 이미지 블록으로 만듭니다. 인코딩 결과는 원본 내용 해시로 캐시합니다.
+"""
+import base64
+import hashlib
+import io
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Pillow가 없으면 리사이즈 없이 원본을 그대로 전송
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# 긴 변이 이보다 크면 모델 쪽에서 어차피 축소되므로 미리 줄여서 보냄
+MAX_LONG_EDGE = 1568
+MAX_PIXELS = 1_150_000
+
+_MAGIC = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+
+
+def _sniff_media_type(data):
+    head = bytes(data[:12])
+    for magic, media_type in _MAGIC:
+        if head.startswith(magic):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class _Source:
+    """경로/bytes/mmap 입력을 복사 없이 다루기 위한 래퍼"""
+
+    def __init__(self, source):
+        self._file = None
+        self._mmap = None
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(Path(source), "rb")
+            try:
+                if os.fstat(self._file.fileno()).st_size == 0:
+                    raise ValueError(f"빈 이미지 파일입니다: {source}")
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.buffer = memoryview(self._mmap)
+            except BaseException:
+                if self._mmap is not None:
+                    self._mmap.close()
+                self._file.close()
+                raise
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self.buffer = memoryview(source)
+        else:
+            raise TypeError(f"지원하지 않는 이미지 입력 형식입니다: {type(source).__name__}")
+
+    def close(self):
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class ImageEncoder:
+    def __init__(self, max_long_edge=MAX_LONG_EDGE, max_pixels=MAX_PIXELS,
+                 jpeg_quality=85, webp_quality=80, cache_bytes=64 * 1024 * 1024):
+        """
+        이미지 인코더 초기화
+
+        Args:
+            max_long_edge: 긴 변 최대 픽셀 수
+            max_pixels: 최대 총 픽셀 수
+            jpeg_quality: JPEG 재인코딩 품질
+            webp_quality: WebP 재인코딩 품질 (투명 배경 이미지에 사용)
+            cache_bytes: 인코딩 결과 캐시의 최대 크기(바이트)
+        """
+        self.max_long_edge = max_long_edge
+        self.max_pixels = max_pixels
+        self.jpeg_quality = jpeg_quality
+        self.webp_quality = webp_quality
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()  # 해시 -> (media_type, base64 문자열)
+        self._cache_size = 0
+        self._lock = threading.Lock()
+
+    def _cache_key(self, buffer):
+        digest = hashlib.sha256(buffer).hexdigest()
+        params = f"{self.max_long_edge}:{self.max_pixels}:{self.jpeg_quality}:{self.webp_quality}"
+        return f"{digest}:{params}"
+
+    def _cache_get(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _cache_put(self, key, value):
+        size = len(value[1])
+        with self._lock:
+            if key in self._cache or size > self.cache_bytes:
+                return
+            self._cache[key] = value
+            self._cache_size += size
+            while self._cache_size > self.cache_bytes:
+                _, (_, data) = self._cache.popitem(last=False)
+                self._cache_size -= len(data)
+
+    def _target_size(self, width, height):
+        scale = min(
+            1.0,
+            self.max_long_edge / max(width, height),
+            (self.max_pixels / (width * height)) ** 0.5,
+        )
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def _reencode(self, buffer):
+        with Image.open(io.BytesIO(buffer)) as img:
+            img.draft("RGB", self._target_size(*img.size))  # JPEG는 디코딩 단계에서 축소
+            img = _apply_exif_orientation(img)
+            size = self._target_size(*img.size)
+            if size != img.size:
+                img = img.resize(size, Image.LANCZOS)
+            out = io.BytesIO()
+            if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+                img.convert("RGBA").save(out, format="WEBP", quality=self.webp_quality, method=4)
+                media_type = "image/webp"
+            else:
+                img.convert("RGB").save(out, format="JPEG", quality=self.jpeg_quality,
+                                        optimize=True, progressive=True)
+                media_type = "image/jpeg"
+        return media_type, out.getvalue()
+
+    def encode(self, source):
+        """
+        이미지를 전송용으로 인코딩
+
+        Args:
+            source: 파일 경로, bytes/bytearray, memoryview 또는 mmap
+
+        Returns:
+            (media_type, base64 문자열)
+        """
+        src = _Source(source)
+        try:
+            key = self._cache_key(src.buffer)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+            if Image is not None:
+                media_type, data = self._reencode(src.buffer)
+                # 이미 작은 원본이 더 작으면 원본 사용 (EXIF가 없는 경우만: GPS 정보/회전 보정 문제)
+                original_type = _sniff_media_type(src.buffer)
+                if original_type and len(src.buffer) <= len(data) and self._can_pass_through(src.buffer):
+                    media_type, data = original_type, src.buffer
+            else:
+                media_type = _sniff_media_type(src.buffer)
+                if media_type is None:
+                    raise ValueError("지원하지 않는 이미지 형식입니다 (JPEG/PNG/GIF/WebP만 가능).")
+                data = src.buffer
+            value = (media_type, base64.standard_b64encode(data).decode("ascii"))
+        finally:
+            src.close()
+        self._cache_put(key, value)
+        return value
+
+    def _can_pass_through(self, buffer):
+        """원본을 그대로 보내도 되는지 (크기가 충분히 작고 EXIF 메타데이터가 없음)"""
+        with Image.open(io.BytesIO(buffer)) as img:
+            if self._target_size(*img.size) != img.size:
+                return False
+            return not img.getexif() and "exif" not in img.info
+
+    def content_block(self, source):
+        """
+        Claude 메시지용 이미지 블록 생성
+
+        Returns:
+            {"type": "image", "source": {...}} dict
+        """
+        media_type, data = self.encode(source)
+        return {
+            "type": "image",
+            "source": {"type": "base64", "media_type": media_type, "data": data},
+        }
+
+
+def _apply_exif_orientation(img):
+    """휴대폰 사진의 EXIF 회전 정보 반영"""
+    try:
+        from PIL import ImageOps
+        return ImageOps.exif_transpose(img)
+    except Exception:
+        return img
+
+
+_default_encoder = None
+
+
+def default_encoder():
+    """프로세스 전역 인코더 (캐시 공유)"""
+    global _default_encoder
+    if _default_encoder is None:
+        _default_encoder = ImageEncoder()
+    return _default_encoder
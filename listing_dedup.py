@@ -0,0 +1,308 @@
+"""
+매물 중복 감지 (MinHash/LSH)
+
+여러 중개사무소가 문구만 조금 바꿔 올린 같은 매물을 찾아내
+이미 생성한 propertyData/content를 재사용하고 LLM 호출을 건너뜁니다.
+인덱스는 SQLite 파일에 저장되므로 실행이 끝나도 유지되고,
+메모리에는 조회에 필요한 행만 올라옵니다.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import struct
+import threading
+import unicodedata
+
+# 2^61 - 1 (메르센 소수) 위에서 a*x + b 형태의 해시 순열을 만듭니다
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_PUNCT_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_listing_text(text):
+    """
+    매물 텍스트 정규화
+
+    전각/반각 통일(NFKC), 소문자화, 문장부호 제거, 공백 정리를 수행합니다.
+
+    Args:
+        text: 원본 매물 텍스트
+
+    Returns:
+        정규화된 문자열
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+_DEAL_RE = re.compile(r"반전세|전세|월세|매매")
+# 천 단위 쉼표는 3자리 묶음만 허용 ("500/50,3층"이 "503층"으로 붙지 않도록)
+_NUMBER_RE = re.compile(r"\d+(?:,\d{3})*(?:\.\d+)?(?:억|천|만|층|m2|평|원)?")
+
+
+def structured_key(text):
+    """
+    가격/층/면적/거래 유형처럼 정확히 같아야 하는 값으로 만든 키
+
+    텍스트가 비슷해도 보증금, 층, 거래 유형이 다르면 다른 매물이므로
+    이 키가 같을 때만 저장된 결과를 재사용합니다.
+
+    Args:
+        text: 원본 매물 텍스트
+
+    Returns:
+        키 문자열 (예: "전세#1억,3층,4천,72.85m2")
+    """
+    compact = _SPACE_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+    deals = sorted(set(_DEAL_RE.findall(compact)))
+    numbers = sorted(token.replace(",", "") for token in _NUMBER_RE.findall(compact))
+    return "|".join(deals) + "#" + ",".join(numbers)
+
+
+def shingles(text, k=5):
+    """
+    문자 k-gram 집합 생성 (한국어는 띄어쓰기가 들쭉날쭉해 문자 단위가 안정적)
+
+    Args:
+        text: 정규화된 텍스트
+        k: shingle 길이
+
+    Returns:
+        shingle 문자열 집합
+    """
+    compact = text.replace(" ", "")
+    if len(compact) <= k:
+        return {compact} if compact else set()
+    return {compact[i:i + k] for i in range(len(compact) - k + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=128, seed=1):
+        """
+        MinHash 서명 생성기
+
+        Args:
+            num_perm: 해시 순열 개수 (서명 길이)
+            seed: 순열 계수 생성용 시드 (인덱스와 조회 시 동일해야 함)
+        """
+        self.num_perm = num_perm
+        params = []
+        for i in range(num_perm):
+            digest = hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=16).digest()
+            a, b = struct.unpack("<QQ", digest)
+            params.append(((a % (_MERSENNE_PRIME - 1)) + 1, b % _MERSENNE_PRIME))
+        self._params = params
+
+    def signature(self, shingle_set):
+        """
+        shingle 집합의 MinHash 서명 계산
+
+        Returns:
+            길이 num_perm인 정수 튜플
+        """
+        if not shingle_set:
+            return (_MAX_HASH,) * self.num_perm
+        hashes = [
+            struct.unpack("<I", hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest())[0]
+            for s in shingle_set
+        ]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        )
+
+
+def estimate_jaccard(sig_a, sig_b):
+    """두 MinHash 서명으로 Jaccard 유사도 추정"""
+    same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return same / len(sig_a)
+
+
+class ListingDeduplicator:
+    def __init__(self, db_path="listing_dedup.sqlite3", threshold=0.8,
+                 num_perm=128, bands=32, shingle_size=5, min_shingles=8):
+        """
+        SQLite 기반 근접 중복 매물 인덱스
+
+        서명을 bands개 구간으로 나눠 구간별 버킷에 넣는 LSH 방식이라
+        전체 매물을 훑지 않고 후보만 조회합니다.
+
+        Args:
+            db_path: 인덱스 파일 경로 (":memory:"도 가능)
+            threshold: 중복으로 볼 최소 Jaccard 유사도
+            num_perm: MinHash 순열 개수
+            bands: LSH 밴드 수 (num_perm을 나누어떨어지게 해야 함)
+            shingle_size: 문자 shingle 길이
+            min_shingles: shingle이 이보다 적은 짧은 텍스트는 중복 검사를 하지 않음
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands로 나누어떨어져야 합니다.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS listings (
+                id INTEGER PRIMARY KEY,
+                signature BLOB NOT NULL,
+                key TEXT,
+                result TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                listing_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (band, bucket);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(listings)")}
+        if "key" not in columns:
+            # 이전 버전 인덱스: key가 없는 기존 행은 재사용 대상에서 제외됨
+            self._conn.execute("ALTER TABLE listings ADD COLUMN key TEXT")
+
+    def close(self):
+        """DB 연결 종료"""
+        self._conn.close()
+
+    def _fingerprint(self, text):
+        """
+        (MinHash 서명, 구조화 키) 계산
+
+        Returns:
+            텍스트가 너무 짧아 비교할 수 없으면 None
+        """
+        shingle_set = shingles(normalize_listing_text(text), self.shingle_size)
+        if len(shingle_set) < self.min_shingles:
+            return None
+        return self.hasher.signature(shingle_set), structured_key(text)
+
+    def _band_keys(self, signature):
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(struct.pack(f"<{self.rows}I", *chunk), digest_size=8).digest()
+            # SQLite INTEGER는 부호 있는 64비트
+            keys.append((band, struct.unpack("<q", digest)[0]))
+        return keys
+
+    def _pack(self, signature):
+        return struct.pack(f"<{len(signature)}I", *signature)
+
+    def _unpack(self, blob):
+        return struct.unpack(f"<{len(blob) // 4}I", blob)
+
+    def find(self, text):
+        """
+        근접 중복 매물의 저장된 결과 조회
+
+        Args:
+            text: 매물 텍스트
+
+        Returns:
+            (결과 dict, 유사도) 또는 중복이 없으면 None
+        """
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return None
+        return self._find_fingerprint(fingerprint)
+
+    def _find_fingerprint(self, fingerprint):
+        signature, key = fingerprint
+        best = None
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._band_keys(signature):
+                rows = self._conn.execute(
+                    "SELECT listing_id FROM buckets WHERE band = ? AND bucket = ?",
+                    (band, bucket),
+                )
+                candidates.update(row[0] for row in rows)
+            for listing_id in candidates:
+                row = self._conn.execute(
+                    "SELECT signature, result FROM listings WHERE id = ? AND key = ?",
+                    (listing_id, key),
+                ).fetchone()
+                if row is None:
+                    continue
+                score = estimate_jaccard(signature, self._unpack(row[0]))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (row[1], score)
+        if best is None:
+            return None
+        return json.loads(best[0]), best[1]
+
+    def add(self, text, result):
+        """
+        매물과 생성 결과를 인덱스에 추가
+
+        Args:
+            text: 매물 텍스트
+            result: 재사용할 결과 (예: {"propertyData": ..., "content": ...})
+
+        Returns:
+            색인했으면 True, 텍스트가 너무 짧아 건너뛰었으면 False
+        """
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return False
+        self._add_fingerprint(fingerprint, result)
+        return True
+
+    def _add_fingerprint(self, fingerprint, result):
+        signature, key = fingerprint
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO listings (signature, key, result) VALUES (?, ?, ?)",
+                (self._pack(signature), key, json.dumps(result, ensure_ascii=False)),
+            )
+            listing_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO buckets (band, bucket, listing_id) VALUES (?, ?, ?)",
+                [(band, bucket, listing_id) for band, bucket in self._band_keys(signature)],
+            )
+
+    def get_or_generate(self, text, generate):
+        """
+        중복이면 저장된 결과를 반환하고, 아니면 generate를 호출해 저장
+        (텍스트가 너무 짧으면 중복 검사 없이 generate 호출)
+
+        Args:
+            text: 매물 텍스트
+            generate: text를 받아 결과 dict를 돌려주는 함수 (LLM 호출부)
+
+        Returns:
+            결과 dict
+        """
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return generate(text)
+        found = self._find_fingerprint(fingerprint)
+        if found is not None:
+            return found[0]
+        result = generate(text)
+        self._add_fingerprint(fingerprint, result)
+        return result
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+
+if __name__ == "__main__":
+    # 사용 예제
+    dedup = ListingDeduplicator(":memory:")
+    a = "경기 이천시 관고동 월드타운 오피스텔 전세 1억4천, 3층, 72.85m², 엘리베이터/주차 가능"
+    b = "경기 이천시 관고동 월드타운 오피스텔 전세 1억 4천 / 3층 / 72.85㎡ / 엘리베이터, 주차 가능!"
+    dedup.add(a, {"propertyData": {"region": "경기 이천시 관고동"}, "content": {}})
+    print("중복 조회 결과:", dedup.find(b))
@@ -3,11 +3,12 @@ Claude API 로그인 인터페이스
 """
 import os
 import sys
-import webbrowser
-from pathlib import Path
+
+import env_file
 
 def open_anthropic_console():
     """Anthropic 콘솔을 브라우저에서 열기"""
+    import webbrowser
     url = "https://console.anthropic.com/"
     print(f"브라우저에서 Anthropic 콘솔을 엽니다: {url}")
     webbrowser.open(url)
@@ -16,27 +17,7 @@ def open_anthropic_console():
 
 def save_api_key_to_env(api_key):
     """API 키를 .env 파일에 저장"""
-    env_file = Path(".env")
-    
-    # .env 파일 읽기
-    env_content = {}
-    if env_file.exists():
-        with open(env_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_content[key.strip()] = value.strip()
-    
-    # API 키 업데이트
-    env_content['ANTHROPIC_API_KEY'] = api_key
-    
-    # .env 파일 쓰기
-    with open(env_file, 'w', encoding='utf-8') as f:
-        f.write("# Claude API 키 설정\n")
-        f.write("# 이 파일은 .gitignore에 포함되어 있어 Git에 커밋되지 않습니다\n\n")
-        f.write(f"ANTHROPIC_API_KEY={api_key}\n")
-    
+    env_file.save_api_key(api_key)
     print(f"✓ API 키가 .env 파일에 저장되었습니다!")
 
 def login():
@@ -129,19 +110,9 @@ def login():
 
 def verify_login():
     """로그인 상태 확인 및 테스트"""
+    env_file.load_env()
     api_key = os.getenv("ANTHROPIC_API_KEY")
     
-    if not api_key:
-        # .env 파일에서 읽기 시도
-        env_file = Path(".env")
-        if env_file.exists():
-            try:
-                from dotenv import load_dotenv
-                load_dotenv()
-                api_key = os.getenv("ANTHROPIC_API_KEY")
-            except ImportError:
-                pass
-    
     if not api_key:
         print("❌ API 키가 설정되지 않았습니다.")
         return False
@@ -5,9 +5,10 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 import webbrowser
 import threading
 import os
-from pathlib import Path
 import urllib.parse
 
+from env_file import save_api_key
+
 class LoginHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         if self.path == '/' or self.path == '/login':
@@ -195,10 +196,7 @@ class LoginHandler(BaseHTTPRequestHandler):
             
             if api_key:
                 # .env 파일에 저장
-                env_file = Path(".env")
-                with open(env_file, 'w', encoding='utf-8') as f:
-                    f.write("# Claude API 키 설정\n")
-                    f.write(f"ANTHROPIC_API_KEY={api_key}\n")
+                save_api_key(api_key)
                 
                 self.send_response(200)
                 self.send_header('Content-type', 'text/plain; charset=utf-8')
@@ -2,16 +2,13 @@
 빠른 로그인 - API 키가 있는 경우
 """
 import os
-from pathlib import Path
+
+import env_file
 
 def save_api_key(api_key):
     """API 키를 .env 파일과 환경변수에 저장"""
     # .env 파일에 저장
-    env_file = Path(".env")
-    with open(env_file, 'w', encoding='utf-8') as f:
-        f.write("# Claude API 키 설정\n")
-        f.write("# 이 파일은 .gitignore에 포함되어 있어 Git에 커밋되지 않습니다\n\n")
-        f.write(f"ANTHROPIC_API_KEY={api_key}\n")
+    env_file.save_api_key(api_key)
     
     # 환경변수에도 설정
     os.environ["ANTHROPIC_API_KEY"] = api_key
@@ -28,17 +25,7 @@ def main():
     print()
     
     # 현재 키 확인
-    current_key = os.getenv("ANTHROPIC_API_KEY")
-    env_file = Path(".env")
-    if env_file.exists():
-        try:
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.startswith('ANTHROPIC_API_KEY='):
-                        current_key = line.split('=', 1)[1].strip()
-                        break
-        except:
-            pass
+    current_key = env_file.read_env().get("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
     
     if current_key:
         print("[현재 설정된 API 키]")
@@ -0,0 +1,164 @@
+"""
+ClaudeClient 앞단 요청 스케줄러
+
+같은 API 키를 쓰는 대화형 요청과 배치 작업을 우선순위 클래스로 나누고,
+클래스 안에서는 테넌트별 가중 공정 큐잉(WFQ)으로 순서를 정합니다.
+마감 시간이 지난 요청은 API를 호출하지 않고 버립니다.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+INTERACTIVE = 0
+BATCH = 1
+
+
+class DeadlineExceeded(Exception):
+    """실행 전에 마감 시간이 지나 버려진 요청"""
+
+
+class RequestScheduler:
+    def __init__(self, max_concurrency=4, interactive_reserved=1, tenant_weights=None):
+        """
+        요청 스케줄러 초기화
+
+        Args:
+            max_concurrency: 동시에 실행할 최대 요청 수
+            interactive_reserved: 배치 요청이 쓸 수 없도록 대화형에 남겨둘 슬롯 수
+            tenant_weights: 테넌트별 가중치 (예: {"web": 3, "nightly": 1}, 기본 1)
+        """
+        if interactive_reserved >= max_concurrency:
+            raise ValueError("interactive_reserved는 max_concurrency보다 작아야 합니다.")
+        self.max_concurrency = max_concurrency
+        self.interactive_reserved = interactive_reserved
+        self.tenant_weights = dict(tenant_weights or {})
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "shed": 0}
+
+        self._queues = {INTERACTIVE: [], BATCH: []}
+        self._virtual_time = {INTERACTIVE: 0.0, BATCH: 0.0}
+        self._last_finish = {}  # (priority, tenant) -> 가상 종료 시각
+        self._running = 0
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"scheduler-{i}", daemon=True)
+            for i in range(max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, fn, *args, priority=INTERACTIVE, tenant="default",
+               deadline=None, timeout=None, cost=1.0, **kwargs):
+        """
+        요청 등록
+
+        Args:
+            fn: 실행할 함수 (예: claude.send_message)
+            priority: INTERACTIVE 또는 BATCH
+            tenant: 공정 분배 단위 (도구/작업 이름 등)
+            deadline: time.monotonic() 기준 절대 마감 시각
+            timeout: 지금부터의 상대 마감 시간(초), deadline 대신 사용 가능
+            cost: 요청 비용 (예상 토큰 수 등), 클수록 테넌트 몫을 많이 씀
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if priority not in self._queues:
+            raise ValueError(f"알 수 없는 우선순위: {priority}")
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("스케줄러가 종료되었습니다.")
+            weight = self.tenant_weights.get(tenant, 1.0)
+            key = (priority, tenant)
+            start = max(self._virtual_time[priority], self._last_finish.get(key, 0.0))
+            finish = start + cost / weight
+            self._last_finish[key] = finish
+            heapq.heappush(
+                self._queues[priority],
+                (finish, next(self._counter), deadline, future, fn, args, kwargs),
+            )
+            self.stats["submitted"] += 1
+            self._cond.notify()
+        return future
+
+    def _can_run(self, priority):
+        if priority == INTERACTIVE:
+            return self._running < self.max_concurrency
+        return self._running < self.max_concurrency - self.interactive_reserved
+
+    def _next_item(self):
+        """조건 변수 잠금 상태에서 호출: 실행할 항목 하나를 꺼냄"""
+        for priority in (INTERACTIVE, BATCH):
+            queue = self._queues[priority]
+            while queue and self._can_run(priority):
+                finish, _, deadline, future, fn, args, kwargs = heapq.heappop(queue)
+                self._virtual_time[priority] = max(self._virtual_time[priority], finish)
+                if deadline is not None and time.monotonic() > deadline:
+                    self.stats["shed"] += 1
+                    future.set_exception(DeadlineExceeded("마감 시간이 지나 요청을 실행하지 않았습니다."))
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    continue
+                return future, fn, args, kwargs
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                item = self._next_item()
+                while item is None:
+                    if self._closed and not any(self._queues.values()):
+                        return
+                    self._cond.wait()
+                    item = self._next_item()
+                self._running += 1
+            future, fn, args, kwargs = item
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+                outcome = "failed"
+            else:
+                future.set_result(result)
+                outcome = "completed"
+            with self._cond:
+                self._running -= 1
+                self.stats[outcome] += 1
+                self._cond.notify_all()
+
+    def pending(self):
+        """대기 중인 요청 수 (우선순위별)"""
+        with self._cond:
+            return {priority: len(queue) for priority, queue in self._queues.items()}
+
+    def shutdown(self, wait=True):
+        """
+        스케줄러 종료 (대기 중인 요청은 모두 처리한 뒤 워커 종료)
+
+        Args:
+            wait: 워커 종료까지 기다릴지 여부
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+if __name__ == "__main__":
+    # 사용 예제 (실제 API 대신 지연 함수 사용)
+    scheduler = RequestScheduler(max_concurrency=2, tenant_weights={"web": 3})
+    slow = lambda name: (time.sleep(0.1), name)[1]
+    batch = [scheduler.submit(slow, f"batch-{i}", priority=BATCH, tenant="nightly") for i in range(5)]
+    web = scheduler.submit(slow, "web", tenant="web", timeout=1.0)
+    print("대화형 결과:", web.result())
+    print("배치 결과:", [f.result() for f in batch])
+    scheduler.shutdown()
+    print("통계:", scheduler.stats)
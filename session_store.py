@@ -0,0 +1,191 @@
+"""
+SQLite 기반 대화 세션 저장소
+
+대화 기록을 세션 ID별로 디스크에 추가 전용(append-only)으로 기록하고,
+다음 요청에 필요한 최근 turn만 메모리에 올립니다.
+오래 사용하지 않은 세션은 메모리 캐시에서 내보내므로 세션 수가 늘어도 메모리가 일정합니다.
+"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+
+# 인코딩 첫 바이트: 압축 여부
+_RAW = b"r"
+_ZLIB = b"z"
+
+
+def encode_content(content, compress_over=256):
+    """
+    메시지 content를 저장용 바이트로 인코딩 (긴 내용은 zlib 압축)
+
+    Args:
+        content: 문자열 또는 content 블록 리스트
+        compress_over: 이 크기(바이트)를 넘으면 압축
+    """
+    data = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(data) > compress_over:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return _ZLIB + compressed
+    return _RAW + data
+
+
+def decode_content(blob):
+    """encode_content의 역변환"""
+    blob = bytes(blob)
+    data = zlib.decompress(blob[1:]) if blob[:1] == _ZLIB else blob[1:]
+    return json.loads(data.decode("utf-8"))
+
+
+class SessionStore:
+    def __init__(self, db_path="sessions.sqlite3", window=20, max_cached_sessions=1000,
+                 idle_seconds=600.0):
+        """
+        세션 저장소 초기화
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:"도 가능)
+            window: 요청에 포함할 최근 turn 수
+            max_cached_sessions: 메모리에 유지할 최대 세션 수
+            idle_seconds: 이 시간 동안 사용하지 않은 세션은 메모리에서 제거
+        """
+        self.window = window
+        self.max_cached_sessions = max_cached_sessions
+        self.idle_seconds = idle_seconds
+        self._cache = OrderedDict()  # session_id -> (마지막 사용 시각, deque(turns), 다음 seq)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS turns (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def close(self):
+        """DB 연결 종료"""
+        with self._lock:
+            self._cache.clear()
+            self._conn.close()
+
+    def _load(self, session_id):
+        """잠금 상태에서 호출: 캐시 또는 DB에서 최근 turn 로드"""
+        entry = self._cache.get(session_id)
+        if entry is not None:
+            # 다른 워커가 같은 세션에 기록했을 수 있으므로 마지막 seq만 확인 (인덱스 조회)
+            last_seq = self._conn.execute(
+                "SELECT MAX(seq) FROM turns WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            if (last_seq + 1 if last_seq is not None else 0) != entry[2]:
+                entry = None
+        if entry is None:
+            rows = self._conn.execute(
+                "SELECT seq, role, content FROM turns WHERE session_id = ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, self.window),
+            ).fetchall()
+            rows.reverse()
+            turns = deque(
+                ({"role": role, "content": decode_content(content)} for _, role, content in rows),
+                maxlen=self.window,
+            )
+            next_seq = rows[-1][0] + 1 if rows else 0
+            entry = [0.0, turns, next_seq]
+            self._cache[session_id] = entry
+        entry[0] = time.monotonic()
+        self._cache.move_to_end(session_id)
+        self._evict()
+        return entry
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._cache:
+            session_id, (last_used, _, _) = next(iter(self._cache.items()))
+            if len(self._cache) > self.max_cached_sessions or now - last_used > self.idle_seconds:
+                del self._cache[session_id]
+            else:
+                break
+
+    def append(self, session_id, *turns):
+        """
+        turn 추가 (하나의 트랜잭션으로 기록)
+
+        Args:
+            session_id: 세션 ID
+            turns: {"role": ..., "content": ...} dict들
+        """
+        encoded = [(turn["role"], encode_content(turn["content"])) for turn in turns]
+        with self._lock:
+            for attempt in range(2):
+                entry = self._load(session_id)
+                seq = entry[2]
+                now = time.time()
+                rows = [
+                    (session_id, seq + i, role, content, now)
+                    for i, (role, content) in enumerate(encoded)
+                ]
+                try:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT INTO turns (session_id, seq, role, content, created_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            rows,
+                        )
+                    break
+                except sqlite3.IntegrityError:
+                    # 다른 워커가 같은 세션에 먼저 기록함: 캐시를 버리고 다시 읽음
+                    self._cache.pop(session_id, None)
+                    if attempt:
+                        raise
+            entry[1].extend({"role": t["role"], "content": t["content"]} for t in turns)
+            entry[2] = seq + len(rows)
+
+    def messages(self, session_id, extra=None):
+        """
+        다음 요청에 쓸 메시지 리스트 (최근 window개, 첫 메시지는 항상 user)
+
+        Args:
+            session_id: 세션 ID
+            extra: 뒤에 덧붙일 메시지 리스트 (아직 저장하지 않은 새 turn)
+        """
+        with self._lock:
+            turns = list(self._load(session_id)[1])
+        turns.extend(extra or [])
+        if len(turns) > self.window:
+            turns = turns[-self.window:]
+        while turns and turns[0]["role"] != "user":
+            turns.pop(0)
+        return turns
+
+    def history(self, session_id):
+        """세션 전체 기록 (DB에서 순서대로 읽음)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM turns WHERE session_id = ? ORDER BY seq",
+                (session_id,),
+            ).fetchall()
+        return [{"role": role, "content": decode_content(content)} for role, content in rows]
+
+    def delete(self, session_id):
+        """세션 삭제"""
+        with self._lock:
+            self._cache.pop(session_id, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+
+    def cached_sessions(self):
+        """현재 메모리에 올라와 있는 세션 수"""
+        with self._lock:
+            self._evict()
+            return len(self._cache)
@@ -3,6 +3,8 @@
 """
 import sys
 
+from env_file import save_api_key
+
 # API 키를 명령줄 인자로 받기
 if len(sys.argv) < 2:
     print("사용법: python set_key_direct.py YOUR_API_KEY")
@@ -18,10 +20,7 @@ if not api_key:
 
 # .env 파일에 저장
 try:
-    with open('.env', 'w', encoding='utf-8') as f:
-        f.write("# Claude API 키 설정\n")
-        f.write("# 이 파일은 .gitignore에 포함되어 있어 Git에 커밋되지 않습니다\n\n")
-        f.write(f"ANTHROPIC_API_KEY={api_key}\n")
+    save_api_key(api_key)
     
     print("✓ API 키가 .env 파일에 저장되었습니다!")
     print(f"  길이: {len(api_key)} 문자")
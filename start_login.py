@@ -6,27 +6,12 @@ import sys
 import os
 
 def check_python():
-    """Python 설치 확인"""
-    try:
-        result = subprocess.run(['python', '--version'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print(f"✓ Python 설치 확인: {result.stdout.strip()}")
-            return True
-    except:
-        pass
-    
-    try:
-        result = subprocess.run(['py', '--version'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print(f"✓ Python 설치 확인: {result.stdout.strip()}")
-            return True
-    except:
-        pass
-    
-    print("❌ Python이 설치되어 있지 않거나 PATH에 없습니다.")
-    return False
+    """Python 설치 확인 (이 스크립트를 실행 중인 인터프리터 정보 사용)"""
+    if sys.version_info < (3, 8):
+        print(f"❌ Python 3.8 이상이 필요합니다: {sys.version.split()[0]}")
+        return False
+    print(f"✓ Python 설치 확인: Python {sys.version.split()[0]}")
+    return True
 
 def check_files():
     """필요한 파일 확인"""
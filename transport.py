@@ -0,0 +1,177 @@
+"""
+ClaudeClient 전송 계층
+
+- AnthropicTransport: 실제 API 호출 (기본값)
+- RecordingTransport: 요청/응답(스트리밍 조각과 시간 포함)을 카세트 파일에 기록
+- ReplayTransport: 카세트 파일의 응답을 API 호출 없이 재생 (원래 속도 또는 가속)
+
+카세트는 gzip으로 압축한 JSON Lines 파일이며, 요청은 정규화한 JSON의 해시로 매칭합니다.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+
+class CassetteMiss(KeyError):
+    """카세트에 해당 요청이 없음"""
+
+
+def request_key(request):
+    """
+    요청의 정규 해시 (키 순서와 공백에 영향받지 않음)
+
+    Args:
+        request: messages.create에 넘길 인자 dict
+    """
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AnthropicTransport:
+    def __init__(self, api_key, base_url=None):
+        """
+        실제 Anthropic API 전송
+
+        Args:
+            api_key: Anthropic API 키
+            base_url: API 주소
+        """
+        # anthropic SDK는 import가 무거워 전송 객체를 만들 때 불러옴
+        from anthropic import Anthropic
+        self.client = Anthropic(api_key=api_key, base_url=base_url)
+
+    def create(self, **request):
+        """응답 텍스트 반환"""
+        response = self.client.messages.create(**request)
+        return response.content[0].text
+
+    def stream(self, **request):
+        """응답 텍스트 조각을 순서대로 반환하는 제너레이터"""
+        with self.client.messages.stream(**request) as stream:
+            for text in stream.text_stream:
+                yield text
+
+
+class RecordingTransport:
+    def __init__(self, inner, path):
+        """
+        기록 모드 전송
+
+        Args:
+            inner: 실제 호출을 수행할 전송 객체 (예: AnthropicTransport)
+            path: 카세트 파일 경로 (있으면 뒤에 이어서 기록)
+        """
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            # gzip 스트림 하나를 열어 두고 이어서 기록 (레코드마다 새 gzip 멤버를 만들면 압축률이 떨어짐)
+            if self._file is None:
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line)
+            # 중간에 프로세스가 죽어도 기록된 레코드는 읽을 수 있도록 동기화 플러시
+            self._file.flush()
+
+    def close(self):
+        """카세트 파일 닫기 (gzip 트레일러 기록)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def create(self, **request):
+        start = time.monotonic()
+        text = self.inner.create(**request)
+        self._write({
+            "key": request_key(request),
+            "kind": "create",
+            "request": request,
+            "elapsed": time.monotonic() - start,
+            "response": text,
+        })
+        return text
+
+    def stream(self, **request):
+        start = time.monotonic()
+        chunks = []
+        for text in self.inner.stream(**request):
+            chunks.append([time.monotonic() - start, text])
+            yield text
+        # 스트림을 끝까지 읽은 경우에만 기록
+        self._write({
+            "key": request_key(request),
+            "kind": "stream",
+            "request": request,
+            "elapsed": time.monotonic() - start,
+            "chunks": chunks,
+        })
+
+
+class ReplayTransport:
+    def __init__(self, path, speed=None):
+        """
+        재생 모드 전송
+
+        Args:
+            path: 카세트 파일 경로
+            speed: None이면 지연 없이 즉시 응답, 1.0이면 기록된 시간 그대로,
+                   2.0이면 2배 빠르게 재생
+        """
+        self.speed = speed
+        self.records = []
+        # 같은 요청이 여러 번 기록되어 있으면 기록된 순서대로 응답하고, 마지막 응답은 반복
+        self._queues = defaultdict(deque)
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.records.append(record)
+                        self._queues[(record["kind"], record["key"])].append(record)
+            except EOFError:
+                # 기록 중이거나 close() 없이 종료된 카세트: 플러시된 레코드까지만 사용
+                pass
+
+    def requests(self):
+        """카세트에 기록된 (종류, 요청) 목록 (벤치마크 재생용)"""
+        return [(record["kind"], record["request"]) for record in self.records]
+
+    def _next(self, kind, request):
+        with self._lock:
+            queue = self._queues.get((kind, request_key(request)))
+            if not queue:
+                raise CassetteMiss(f"카세트에 기록되지 않은 요청입니다 ({kind}, model={request.get('model')})")
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def _sleep_until(self, start, offset):
+        if self.speed:
+            delay = offset / self.speed - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+    def create(self, **request):
+        start = time.monotonic()
+        record = self._next("create", request)
+        self._sleep_until(start, record["elapsed"])
+        return record["response"]
+
+    def stream(self, **request):
+        start = time.monotonic()
+        record = self._next("stream", request)
+        for offset, text in record["chunks"]:
+            self._sleep_until(start, offset)
+            yield text